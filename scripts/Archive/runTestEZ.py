@@ -10,6 +10,7 @@ Previously used to: initialize git submodules, create a test Roblox place file
 """
 
 import os
+import subprocess
 import sys
 from pathlib import Path
 from typing import Optional
@@ -37,6 +38,8 @@ def main():
         print("Test place not found, creating it...")
         run_command(["rojo", "build", "-o", TEST_PLACE])
 
+    abs_test_place = os.path.abspath(TEST_PLACE)
+
     # Ask about opening Roblox Studio
     user_input = input("Do you want to open Roblox Studio? (y/n): ").strip().lower()
     
@@ -45,8 +48,16 @@ def main():
 
         if roblox_studio_path:
             print("Opening Roblox Studio...")
-            # Use subprocess.Popen to open without waiting
-            subprocess.Popen([str(roblox_studio_path), str(test_place.absolute())])
+            # Launch detached without waiting; Studio runs independently of
+            # this script, so it gets no handles to our stdio.
+            subprocess.Popen(
+                [os.fspath(roblox_studio_path), abs_test_place],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                close_fds=True,
+                creationflags=subprocess.DETACHED_PROCESS if os.name == "nt" else 0,
+            )
         else:
             print("Error: Could not find Roblox Studio installation.")
             print("Please open the test place manually.")
@@ -62,11 +73,13 @@ def find_roblox_studio() -> Optional[Path]:
         roblox_versions_dir = Path(f"C:/Users/{username}/AppData/Local/Roblox/Versions")
         
         if roblox_versions_dir.is_dir():
-            for version_dir in roblox_versions_dir.iterdir():
-                if version_dir.is_dir():
-                    studio_exe = version_dir / "RobloxStudioBeta.exe"
-                    if studio_exe.is_file():
-                        return studio_exe
+            # scandir's cached entry type avoids a stat() per version folder.
+            with os.scandir(roblox_versions_dir) as it:
+                for version_dir in it:
+                    if version_dir.is_dir():
+                        studio_exe = os.path.join(version_dir.path, "RobloxStudioBeta.exe")
+                        if os.path.isfile(studio_exe):
+                            return Path(studio_exe)
     
     elif sys.platform == "darwin":
         # macOS
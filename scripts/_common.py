@@ -25,21 +25,25 @@ Exported names
 SRC_DIR               : Path constant pointing to ``lib/``
 WALLY_IGNORE_LIST     : Default list of names preserved when cleaning a package dir
 find_project_root()   : Walk up cwd until ``lib/`` is found; chdir there
+list_package_dirs()   : Package directories under ``lib/``, optionally by name
+find_tool()           : Cached ``shutil.which`` lookup of an external tool
 run_command()         : Thin subprocess wrapper with error printing
 clear_package_dir()   : Remove all entries in a package dir except ignored names
+fast_rmtree()         : Delete a directory tree without shutil.rmtree's overhead
 increment_version()   : Bump a ``MAJOR.MINOR.PATCH`` semver string
 write_github_output() : Append a key=value pair to the GitHub Actions output file
-parse_wally_toml()    : Lightweight ``wally.toml`` section/key parser
+parse_wally_toml()    : Parse a ``wally.toml`` into section → key → value dicts
 """
 
 from __future__ import annotations
 
 import fnmatch
+import functools
 import os
 import shutil
 import subprocess
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterable, Optional
 
 
 # ---------------------------------------------------------------------------
@@ -70,21 +74,74 @@ def find_project_root() -> Path:
     Returns:
         The resolved project-root :class:`~pathlib.Path`.
     """
-    current_dir = Path.cwd()
-    while current_dir != current_dir.parent:
-        if (current_dir / SRC_DIR).is_dir():
+    # Walk with plain os.path strings; building a Path per ancestor is wasted
+    # work since only one of them is ever returned.
+    src_dir = os.fspath(SRC_DIR)
+    start = current_dir = os.getcwd()
+    parent = os.path.dirname(current_dir)
+    while current_dir != parent:
+        if os.path.isdir(os.path.join(current_dir, src_dir)):
             os.chdir(current_dir)
-            return current_dir
-        current_dir = current_dir.parent
+            return Path(current_dir)
+        current_dir, parent = parent, os.path.dirname(parent)
     # Already at filesystem root, or lib/ is not present in any ancestor.
-    return Path.cwd()
+    return Path(start)
+
+
+# ---------------------------------------------------------------------------
+# Package discovery
+# ---------------------------------------------------------------------------
+
+def list_package_dirs(names: Optional[Iterable[str]] = None) -> list[Path]:
+    """Return the package directories under :data:`SRC_DIR`, sorted by name.
+
+    Arguments:
+        names: Package directory names to select.  When given, only those
+               directories are checked (a single ``stat`` each) instead of
+               listing all of ``lib/``; names that are not a directory under
+               ``lib/`` are reported and skipped.  Only single, plain path
+               components are accepted, so e.g. ``.``, ``..`` or an absolute
+               path can never select a directory outside ``lib/``.  When
+               ``None`` or empty, every package directory is returned.
+    """
+    if names:
+        package_dirs = []
+        for name in sorted(set(names)):
+            # Path(name).name differs from name for anything with a separator,
+            # drive or root; "" and "." normalise to an empty name.
+            if name in ("", ".", "..") or Path(name).name != name:
+                print(f"Skipping invalid package name: {name!r}")
+                continue
+            package_dir = SRC_DIR / name
+            if package_dir.is_dir():
+                package_dirs.append(package_dir)
+            else:
+                print(f"Skipping unknown package: {name}")
+        return package_dirs
+
+    with os.scandir(SRC_DIR) as it:
+        return sorted(SRC_DIR / entry.name for entry in it if entry.is_dir())
 
 
 # ---------------------------------------------------------------------------
 # Subprocess helper
 # ---------------------------------------------------------------------------
 
-def run_command(cmd: list, error_msg: Optional[str] = None) -> bool:
+@functools.lru_cache(maxsize=None)
+def find_tool(name: str) -> Optional[str]:
+    """Return the absolute path of the executable *name* on ``PATH``, or ``None``.
+
+    Results are cached for the lifetime of the process; resolving a tool is a
+    full ``PATH`` (and, on Windows, ``PATHEXT``) search.
+    """
+    return shutil.which(name)
+
+
+def run_command(
+    cmd: list,
+    error_msg: Optional[str] = None,
+    cwd: Optional[str | os.PathLike] = None,
+) -> bool:
     """Run *cmd* as a subprocess and return ``True`` on success.
 
     Arguments:
@@ -93,12 +150,25 @@ def run_command(cmd: list, error_msg: Optional[str] = None) -> bool:
         error_msg: Human-readable message to print when the command exits
                    with a non-zero status.  Pass ``None`` to suppress the
                    error message (the function still returns ``False``).
+        cwd:       Working directory for the child process.  Prefer this
+                   over :func:`os.chdir`, which changes the working directory
+                   of the whole (calling) process.
+
+    Bare program names (e.g. ``"wally"``) are resolved to an absolute path
+    with :func:`find_tool`, so ``PATH`` is searched only once per tool.
 
     Returns:
         ``True`` if the process exited with code 0, ``False`` otherwise.
     """
+    program = os.fspath(cmd[0])
+    if not os.path.dirname(program):
+        resolved = find_tool(program)
+        if resolved is None:
+            print(f"Error: Command not found — {program}")
+            return False
+        cmd = [resolved, *cmd[1:]]
     try:
-        subprocess.run(cmd, check=True)
+        subprocess.run(cmd, check=True, cwd=cwd)
         return True
     except subprocess.CalledProcessError:
         if error_msg:
@@ -130,18 +200,70 @@ def clear_package_dir(
                      custom list to preserve additional files, for example::
 
                          clear_package_dir(pkg, WALLY_IGNORE_LIST + ["CHANGELOG.txt"])
+
+    Returns:
+        The number of entries removed.
     """
+    # Plain names are checked with a set lookup; only entries that miss it are
+    # matched against the glob patterns.
+    exact_names = frozenset(p for p in ignore_list if not _has_glob_magic(p))
+    patterns = [p for p in ignore_list if _has_glob_magic(p)]
+
     count = 0
-    for item in package_dir.iterdir():
-        if not any(fnmatch.fnmatch(item.name, pattern) for pattern in ignore_list):
-            if item.is_dir():
-                shutil.rmtree(item)
+    # os.scandir exposes the entry type from the directory read itself, so
+    # unlike Path.iterdir() + is_dir() no extra stat() is needed per entry.
+    with os.scandir(package_dir) as it:
+        for entry in it:
+            name = entry.name
+            if name in exact_names or any(fnmatch.fnmatch(name, p) for p in patterns):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                fast_rmtree(entry.path)
             else:
-                item.unlink()
+                os.unlink(entry.path)
             count += 1
     return count
 
 
+def fast_rmtree(path: str | os.PathLike) -> None:
+    """Delete the directory tree at *path*, bottom-up.
+
+    A lean replacement for :func:`shutil.rmtree` for trees the scripts
+    generate themselves (installed Wally packages, type stubs), skipping its
+    per-entry ``lstat`` and error-recovery machinery.  Symlinks are unlinked,
+    never followed.  Errors propagate as :class:`OSError`.
+
+    On Windows this defers to :func:`shutil.rmtree`: :func:`os.walk` descends
+    into directory junctions there (they are not reported as symlinks), which
+    would delete the junction target's contents.
+    """
+    if os.name == "nt":
+        shutil.rmtree(path)
+        return
+
+    for root, dirs, files in os.walk(path, topdown=False, onerror=_raise_walk_error):
+        for name in files:
+            os.unlink(os.path.join(root, name))
+        for name in dirs:
+            dir_path = os.path.join(root, name)
+            # os.walk reports symlinks to directories in dirs.
+            if os.path.islink(dir_path):
+                os.unlink(dir_path)
+            else:
+                os.rmdir(dir_path)
+    os.rmdir(path)
+
+
+def _raise_walk_error(error: OSError) -> None:
+    """``os.walk`` error hook: re-raise instead of silently skipping the directory."""
+    raise error
+
+
+def _has_glob_magic(pattern: str) -> bool:
+    """Return ``True`` if *pattern* contains :mod:`fnmatch` wildcard characters."""
+    return any(char in pattern for char in "*?[")
+
+
 # ---------------------------------------------------------------------------
 # Semantic versioning
 # ---------------------------------------------------------------------------
@@ -224,19 +346,13 @@ def write_github_output(name: str, value: str) -> None:
 # Wally TOML parsing
 # ---------------------------------------------------------------------------
 
-def parse_wally_toml(file_path: Path) -> dict[str, dict[str, str]]:
+def parse_wally_toml(file_path: Path) -> dict[str, dict[str, Any]]:
     """Parse a ``wally.toml`` file into a nested section → key → value dict.
 
-    This is an intentionally lightweight parser rather than a full TOML
-    implementation — Wally configuration files are simple enough that adding
-    a third-party dependency just to read them would be excessive.
-
-    Supported syntax:
-
-    * ``[section]`` headers
-    * ``key = "value"`` or ``key = 'value'`` assignments
-    * Full-line ``# comments`` and inline trailing ``# comments``
-    * Blank lines (ignored)
+    Parsing is delegated to the standard-library :mod:`tomllib` (Python
+    3.11+), so the full TOML syntax is supported and values keep their TOML
+    types: strings stay strings, but e.g. ``unreleased = true`` yields the
+    bool ``True`` and ``authors = [...]`` a list.
 
     The ``"package"`` and ``"custom"`` sections are always present in the
     returned dict, even when empty.  Any additional sections found in the file
@@ -246,8 +362,10 @@ def parse_wally_toml(file_path: Path) -> dict[str, dict[str, str]]:
         file_path: Path to the ``wally.toml`` file to parse.
 
     Returns:
-        A dict mapping section name → {key: value}.  All values are strings
-        with surrounding quotes stripped.
+        A dict mapping section name → {key: value}.
+
+    Raises:
+        tomllib.TOMLDecodeError: If the file is not valid TOML.
 
     Example::
 
@@ -255,33 +373,12 @@ def parse_wally_toml(file_path: Path) -> dict[str, dict[str, str]]:
         version = config["package"]["version"]   # e.g. "0.3.1"
         docs_link = config["custom"].get("docsLink", "")
     """
-    config: dict[str, dict[str, str]] = {
-        "package": {},
-        "custom": {},
-    }
-    current_section: Optional[str] = None
-
-    with open(file_path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-
-            # Skip blank lines and full-line comments.
-            if not line or line.startswith("#"):
-                continue
-
-            # Detect section headers, e.g. [package] or [dependencies].
-            if line.startswith("[") and line.endswith("]"):
-                current_section = line[1:-1]
-                if current_section not in config:
-                    config[current_section] = {}
-                continue
-
-            # Parse ``key = value`` pairs; strip trailing inline comments.
-            if "=" in line and current_section is not None:
-                key, _, raw_value = line.partition("=")
-                key = key.strip()
-                # Remove inline comment, then strip surrounding quotes.
-                value = raw_value.split("#")[0].strip().strip('"').strip("'")
-                config[current_section][key] = value
-
+    # Imported here so scripts that never read a wally.toml still run on
+    # Python versions older than 3.11.
+    import tomllib
+
+    with open(file_path, "rb") as f:
+        config: dict[str, dict[str, Any]] = tomllib.load(f)
+    config.setdefault("package", {})
+    config.setdefault("custom", {})
     return config
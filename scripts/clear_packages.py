@@ -13,7 +13,7 @@ from pathlib import Path
 # ---------------------------------------------------------------------------
 # Insert scripts/ onto sys.path so _common is importable regardless of cwd.
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from _common import SRC_DIR, WALLY_IGNORE_LIST, find_project_root, clear_package_dir
+from _common import SRC_DIR, find_project_root, clear_package_dir, list_package_dirs
 
 
 def main():
@@ -26,21 +26,8 @@ def main():
         print(f"Error: Source directory {SRC_DIR} does not exist.")
         return 1
 
-    # Get list of packages to process (from args or all)
-    args = sys.argv[1:]
-    process_all = len(args) == 0
-
-    # Process each package directory
-    for package_dir in sorted(SRC_DIR.iterdir()):
-        if not package_dir.is_dir():
-            # print(f"Skipping non-directory: {package_dir}")
-            continue
-
-        # Check if this package should be processed
-        if not process_all and package_dir.name not in args:
-            # print(f"Skipping non-argument directory: {package_dir}")
-            continue
-
+    # Process each package directory (from args or all)
+    for package_dir in list_package_dirs(sys.argv[1:]):
         raw_name = package_dir.name
         # print(f"Parsing directory: {raw_name}")
 
@@ -3,13 +3,16 @@
 Generate README.md from wally.toml files in the lib directory.
 """
 
+import configparser
+import json
 import os
 import re
 import subprocess
 import sys
+from collections import ChainMap
 from datetime import date
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, Optional, Tuple
 from urllib.parse import quote
 
 # ---------------------------------------------------------------------------
@@ -19,17 +22,63 @@ from urllib.parse import quote
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from _common import SRC_DIR, find_project_root, parse_wally_toml
 
+# Parsed wally.toml files, keyed by path and invalidated by mtime/size. Bump
+# WALLY_CACHE_VERSION whenever the shape of parse_wally_toml's output changes.
+WALLY_CACHE_FILE = Path(".cache") / "wally_toml.json"
+WALLY_CACHE_VERSION = 2
+
+
+def read_origin_url_from_git_config() -> Optional[str]:
+    """Read ``remote.origin.url`` directly from the repository's ``.git/config``.
+
+    Walks up from the current directory to the first ``.git`` folder. Returns
+    ``None`` when there is no such folder (e.g. a worktree or submodule, where
+    ``.git`` is a file), the file can't be parsed, or it has no origin URL, so
+    the caller can fall back to asking git itself.
+
+    :class:`configparser.ConfigParser` only understands the plain
+    ``key = value`` subset of git-config syntax; quoting, escapes and inline
+    comments would come back verbatim. Values containing any of ``"``, ``\``,
+    ``;`` or ``#`` are therefore also answered with ``None`` rather than
+    risking a misparsed URL.
+    """
+    current_dir = os.getcwd()
+    while True:
+        git_dir = os.path.join(current_dir, ".git")
+        if os.path.isdir(git_dir):
+            break
+        if os.path.exists(git_dir):
+            return None
+        parent = os.path.dirname(current_dir)
+        if parent == current_dir:
+            return None
+        current_dir = parent
+
+    parser = configparser.ConfigParser(strict=False, interpolation=None)
+    try:
+        if not parser.read(os.path.join(git_dir, "config"), encoding="utf-8"):
+            return None
+    except configparser.Error:
+        return None
+    url = parser.get('remote "origin"', "url", fallback="").strip()
+    if not url or any(char in url for char in '"\\;#'):
+        return None
+    return url
+
 
 def get_git_remote_info() -> Tuple[Optional[str], Optional[str]]:
     """Extract repository owner and name from git remote URL."""
-    try:
-        remote_url = subprocess.check_output(
-            ["git", "config", "--get", "remote.origin.url"],
-            text=True
-        ).strip()
-    except subprocess.CalledProcessError:
-        print("Error: Could not get git remote URL")
-        return None, None
+    # Reading the config file directly avoids spawning git for a single value.
+    remote_url = read_origin_url_from_git_config()
+    if remote_url is None:
+        try:
+            remote_url = subprocess.check_output(
+                ["git", "config", "--get", "remote.origin.url"],
+                text=True
+            ).strip()
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            print("Error: Could not get git remote URL")
+            return None, None
 
     # Handle both HTTPS and SSH URLs
     # HTTPS: https://github.com/owner/repo.git
@@ -43,6 +92,59 @@ def get_git_remote_info() -> Tuple[Optional[str], Optional[str]]:
 
 
 
+# Absolute docs-site URL. The README is rendered on two surfaces: GitHub's repo
+# page (where the table is the only navigation) and the Moonwave landing page.
+# A root-relative /api/... link would 404 on GitHub, so we use the full published
+# URL, which works there and on the production docs site. The one tradeoff is that
+# in `moonwave dev` these links point at the live site rather than localhost; that
+# only affects this index page (guide pages use root-relative links and are fine).
+TABLE_ROW_TEMPLATE = (
+    '| [{formattedName}]({rootDocsLink}/api/{docsLink}) '
+    '| `{formattedName} = "{name}@{version}"` '
+    '| {description} |'
+)
+TABLE_ROW_DEFAULTS = dict.fromkeys(("formattedName", "docsLink", "name", "version", "description"), "")
+
+
+def load_wally_cache() -> Dict[str, dict]:
+    """Load the parsed wally.toml cache, or an empty dict if it is missing or stale."""
+    try:
+        cache = json.loads(WALLY_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != WALLY_CACHE_VERSION:
+        return {}
+    entries = cache.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def save_wally_cache(entries: Dict[str, dict]):
+    """Write the parsed wally.toml cache. Failures are ignored; the cache is optional."""
+    try:
+        # Serialise first: tomllib data may hold values JSON can't represent
+        # (e.g. dates), and a failure then must not leave a truncated file.
+        content = json.dumps({"version": WALLY_CACHE_VERSION, "entries": entries}, indent=2)
+        WALLY_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        WALLY_CACHE_FILE.write_text(content, encoding="utf-8")
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Warning: Could not write {WALLY_CACHE_FILE}: {e}")
+
+
+def load_wally_config(wally_toml: Path, old_cache: Dict[str, dict], new_cache: Dict[str, dict]) -> Dict[str, Dict[str, Any]]:
+    """Parse *wally_toml*, reusing the cached result if the file is unchanged.
+
+    The entry used (cached or freshly parsed) is recorded in *new_cache* so
+    that packages which no longer exist drop out of the cache on save.
+    """
+    key = str(wally_toml)
+    st = os.stat(wally_toml)
+    entry = old_cache.get(key)
+    if not entry or entry.get("mtime") != st.st_mtime_ns or entry.get("size") != st.st_size:
+        entry = {"mtime": st.st_mtime_ns, "size": st.st_size, "data": parse_wally_toml(wally_toml)}
+    new_cache[key] = entry
+    return entry["data"]
+
+
 def generate_banner(repo_owner: str, repo_name: str) -> str:
     """Generate the banner logo line shown at the very top of the README.
 
@@ -74,7 +176,7 @@ def generate_badges(repo_owner: str, repo_name: str, docs_link: str) -> str:
     return " ".join(badges)
 
 
-def get_config_value(config: Dict[str, Dict[str, str]], key: str, default: str = "") -> str:
+def get_config_value(config: Dict[str, Dict[str, Any]], key: str, default: Any = "") -> Any:
     """Get a value from config, checking both package and custom sections."""
     # Check custom section first (for formattedName, docsLink, etc.)
     if key in config.get("custom", {}):
@@ -85,28 +187,36 @@ def get_config_value(config: Dict[str, Dict[str, str]], key: str, default: str =
     return default
 
 
-def generate_table_row(config: Dict[str, Dict[str, str]], docs_link: str) -> str:
+def generate_table_row(config: Dict[str, Dict[str, Any]], docs_link: str) -> str:
     """Generate a markdown table row for a package."""
-    formatted_name = get_config_value(config, "formattedName")
-    package_docs_link = get_config_value(config, "docsLink")
-    package_name = get_config_value(config, "name")
-    package_version = get_config_value(config, "version")
-    package_description = get_config_value(config, "description")
+    # Lookups fall through custom -> package -> empty-string defaults, matching
+    # get_config_value's precedence.
+    values = ChainMap({"rootDocsLink": docs_link}, config["custom"], config["package"], TABLE_ROW_DEFAULTS)
 
     # Use package name if no formatted name provided
-    if not formatted_name:
-        formatted_name = package_name.replace("raild3x/", "")
+    if not values["formattedName"]:
+        formatted_name = values["name"].replace("raild3x/", "")
         print(f"  No formatted name provided for {formatted_name}. Using package name.")
+        values = values.new_child({"formattedName": formatted_name})
 
-    # Absolute docs-site URL. The README is rendered on two surfaces: GitHub's repo
-    # page (where the table is the only navigation) and the Moonwave landing page.
-    # A root-relative /api/... link would 404 on GitHub, so we use the full published
-    # URL, which works there and on the production docs site. The one tradeoff is that
-    # in `moonwave dev` these links point at the live site rather than localhost; that
-    # only affects this index page (guide pages use root-relative links and are fine).
-    full_docs_link = f"{docs_link}/api/{package_docs_link}"
+    return TABLE_ROW_TEMPLATE.format_map(values)
 
-    return f'| [{formatted_name}]({full_docs_link}) | `{formatted_name} = "{package_name}@{package_version}"` | {package_description} |'
+
+def write_file_atomic(path: Path, chunks: Iterable[str]):
+    """Write *chunks* to *path* via a sibling temp file and :func:`os.replace`.
+
+    The chunks are streamed to the buffered file handle as-is, so the caller
+    never has to concatenate them. Readers (and an interrupted run) only ever
+    see the old or the new file, never a partially written one.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(chunks)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 
 def main():
@@ -138,6 +248,8 @@ def main():
     # Collect packages
     released_packages = []
     unreleased_packages = []
+    old_wally_cache = load_wally_cache()
+    wally_cache: Dict[str, dict] = {}
     
     print("\nGenerating README.md...")
     
@@ -155,10 +267,10 @@ def main():
         print(f"Parsing package directory: {package_dir}/")
         
         # Parse the wally.toml file
-        config = parse_wally_toml(wally_toml)
+        config = load_wally_config(wally_toml, old_wally_cache, wally_cache)
         
         # Check if package should be ignored
-        if get_config_value(config, "ignore").lower() == "true":
+        if get_config_value(config, "ignore") is True:
             print(f"  Ignoring package {get_config_value(config, 'name', 'unknown')}")
             continue
         
@@ -166,14 +278,19 @@ def main():
         table_row = generate_table_row(config, docs_link)
         
         # Sort into released or unreleased
-        if get_config_value(config, "unreleased").lower() == "true":
+        if get_config_value(config, "unreleased") is True:
             unreleased_packages.append(table_row)
             print("  -> Marked as unreleased")
         else:
             released_packages.append(table_row)
+
+    if wally_cache != old_wally_cache:
+        save_wally_cache(wally_cache)
     
     # Generate README content
-    readme_content = f"""{generate_badges(repo_owner, repo_name, docs_link)}
+    # Collected as a list of chunks and joined once, rather than grown with +=
+    # (which copies the whole buffer on every append).
+    readme_parts = [f"""{generate_badges(repo_owner, repo_name, docs_link)}
 
 {generate_banner(repo_owner, repo_name)}
 
@@ -183,15 +300,15 @@ def main():
 
 | Package | Latest Version | Description |
 |---------|----------------|-------------|
-"""
+"""]
     
     # Add released packages
     if released_packages:
-        readme_content += "\n".join(released_packages) + "\n"
+        readme_parts += ["\n".join(released_packages), "\n"]
     
     # Add unreleased packages section if there are any
     if unreleased_packages:
-        readme_content += """
+        readme_parts.append("""
 
 ---
 
@@ -201,8 +318,9 @@ def main():
 
 | Package | Latest Version | Description |
 |---------|----------------|-------------|
-"""
-    readme_content += "\n".join(unreleased_packages) + "\n"
+""")
+    readme_parts += ["\n".join(unreleased_packages), "\n"]
+    readme_content = "".join(readme_parts)
 
     # Compare new body against existing README body (ignoring the date footer).
     readme_file = Path("README.md")
@@ -224,10 +342,11 @@ def main():
         return 0
 
     # Body changed — append a fresh date footer and write.
-    readme_content += f"\n---\n\n*Last Modified: {date.today().strftime('%B %d, %Y')}*\n"
-    readme_file.write_text(readme_content, encoding="utf-8")
+    readme_parts.append(f"\n---\n\n*Last Modified: {date.today().strftime('%B %d, %Y')}*\n")
+    write_file_atomic(readme_file, readme_parts)
 
-    print(readme_content)
+    sys.stdout.writelines(readme_parts)
+    print()
     print("\nREADME.md has been generated successfully.")
     return 0
 
@@ -24,6 +24,9 @@ from _common import SRC_DIR, WALLY_IGNORE_LIST, find_project_root, clear_package
 # (it may have been committed alongside the package source).
 PUBLISH_IGNORE_LIST = WALLY_IGNORE_LIST + ["README.md"]
 
+# Matches the ``version = "x.y.z"`` line of a wally.toml; group 1 is the version.
+VERSION_PATTERN = re.compile(rb'^version\s*=\s*"([^"]+)"', re.MULTILINE)
+
 
 def find_exported_types(src_file: Path) -> list[tuple[str, str]]:
     """Return (type_name, type_params_str) pairs for every `export type` in a Luau file.
@@ -147,16 +150,28 @@ def restore_unpublished_files(moved: list[tuple[Path, Path]], removed_dirs: list
 
 def get_current_version(wally_toml: Path) -> Optional[str]:
     """Extract the current version from wally.toml."""
-    content = wally_toml.read_text(encoding="utf-8")
-    match = re.search(r'^version\s*=\s*"([^"]+)"', content, re.MULTILINE)
-    return match.group(1) if match else None
+    match = VERSION_PATTERN.search(wally_toml.read_bytes())
+    return match.group(1).decode("utf-8") if match else None
+
 
+def bump_version(wally_toml: Path, new_version: str) -> bool:
+    """Overwrite the version in wally.toml with *new_version*, in place.
 
-def update_version(wally_toml: Path, old_version: str, new_version: str):
-    """Update the version in wally.toml."""
-    content = wally_toml.read_text(encoding="utf-8")
-    new_content = content.replace(f'version = "{old_version}"', f'version = "{new_version}"')
-    wally_toml.write_text(new_content, encoding="utf-8")
+    Only the bytes from the start of the quoted version onwards are rewritten,
+    rather than re-serialising the whole file. Returns ``False`` if the file
+    has no version line.
+    """
+    with open(wally_toml, "r+b") as f:
+        content = f.read()
+        match = VERSION_PATTERN.search(content)
+        if not match:
+            return False
+        start, end = match.span(1)
+        f.seek(start)
+        f.write(new_version.encode("utf-8"))
+        f.write(content[end:])
+        f.truncate()
+    return True
 
 
 def parse_args() -> argparse.Namespace:
@@ -206,7 +221,7 @@ def main():
         print("Error: --publish and --no-publish cannot be used together.")
         return 1
 
-    original_dir = find_project_root()
+    find_project_root()
 
     # Check if source directory exists
     if not SRC_DIR.is_dir():
@@ -246,7 +261,9 @@ def main():
     if increment_type != "none":
         try:
             new_version = increment_version(current_version, increment_type)
-            update_version(wally_toml, current_version, new_version)
+            if not bump_version(wally_toml, new_version):
+                print("Could not find the version number in wally.toml.")
+                return 1
             print(f"Version updated to {new_version} in wally.toml.")
         except ValueError as e:
             print(str(e))
@@ -311,11 +328,9 @@ def main():
                 )
                 return 1
 
-        # Change to package directory and publish
-        os.chdir(package_dir)
-        publish_success = run_command(["wally", "publish"])
+        # Publish from inside the package directory
+        publish_success = run_command(["wally", "publish"], cwd=package_dir)
     finally:
-        os.chdir(original_dir)
         if temp_init and temp_init.is_file():
             temp_init.unlink()
             print("Cleaned up temporary init.luau.")
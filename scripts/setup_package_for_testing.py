@@ -4,10 +4,12 @@ Setup script for Wally packages environment.
 Sets up proper linting by installing dependencies and generating types.
 """
 
+import errno
 import json
 import os
 import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from convert_requires_to_string_format import process_directory
 from pathlib import Path
 
@@ -16,7 +18,7 @@ from pathlib import Path
 # ---------------------------------------------------------------------------
 # Insert scripts/ onto sys.path so _common is importable regardless of cwd.
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from _common import SRC_DIR, WALLY_IGNORE_LIST, find_project_root, clear_package_dir, run_command
+from _common import SRC_DIR, find_project_root, clear_package_dir, list_package_dirs, run_command
 
 
 def _first_project_path(node) -> str | None:
@@ -75,8 +77,8 @@ def generate_lune_index_shims(index_dir: Path) -> None:
         print(f"Generated Lune require shim: {shim}")
 
 
-def setup_package(package_dir: Path) -> bool:
-    """Setup a single package directory."""
+def install_package(package_dir: Path) -> bool:
+    """Clear a package directory and install its Wally dependencies."""
     raw_name = package_dir.name
     print(f"Parsing directory: {raw_name}")
 
@@ -84,32 +86,31 @@ def setup_package(package_dir: Path) -> bool:
     clear_package_dir(package_dir)
 
     # Install Wally packages
-    print("Installing Wally Package Dependencies...")
-    original_dir = Path.cwd()
-    os.chdir(package_dir)
-    
-    if not run_command(["wally", "install"], "Failed to install Wally packages."):
-        os.chdir(original_dir)
-        return False
-    
-    os.chdir(original_dir)
-
-    # Generate sourcemap
-    print("Generating sourcemap...")
-    if not run_command(
-        ["rojo", "sourcemap", ".", "-o", "sourcemap.json"],
-        "Failed to generate sourcemap."
-    ):
-        return False
+    print(f"Installing Wally Package Dependencies for {raw_name}...")
+    return run_command(
+        ["wally", "install"],
+        f"Failed to install Wally packages for {raw_name}.",
+        cwd=package_dir,
+    )
 
+
+def finalize_package(package_dir: Path) -> bool:
+    """Generate types for a package's installed Wally deps and move them into place.
+
+    Expects ``sourcemap.json`` at the project root to already include the
+    package's ``Packages`` directory, i.e. it must run after
+    :func:`install_package` and a sourcemap regeneration.
+    """
     # Handle Packages directory if it exists
     packages_dir = package_dir / "Packages"
     if packages_dir.is_dir():
+        raw_name = package_dir.name
+
         # Generate Wally Package Types
-        print("Generating Wally Package Types...")
+        print(f"Generating Wally Package Types for {raw_name}...")
         if not run_command(
             ["wally-package-types", "--sourcemap", "sourcemap.json", str(packages_dir)],
-            "Failed to generate Wally package types."
+            f"Failed to generate Wally package types for {raw_name}."
         ):
             return False
 
@@ -120,10 +121,18 @@ def setup_package(package_dir: Path) -> bool:
         generate_lune_index_shims(packages_dir / "_Index")
 
         # Move files out of Packages directory
-        print("Moving Wally Packages out of Packages directory...")
-        for item in packages_dir.iterdir():
-            dest = package_dir / item.name
-            shutil.move(str(item), str(dest))
+        print(f"Moving Wally Packages out of {packages_dir}...")
+        with os.scandir(packages_dir) as it:
+            entries = list(it)
+        for entry in entries:
+            dest = os.path.join(package_dir, entry.name)
+            try:
+                # Same filesystem in practice: a single rename() syscall.
+                os.rename(entry.path, dest)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(entry.path, dest)
         print("Moved visible files.")
 
         # Remove the empty Packages directory
@@ -133,6 +142,31 @@ def setup_package(package_dir: Path) -> bool:
     return True
 
 
+def run_in_parallel(task, package_dirs: list[Path]) -> list[Path]:
+    """Run *task* for every package directory in a process pool.
+
+    Each task is dominated by waiting on an external tool
+    (``wally-package-types``), so packages are processed concurrently.
+    Returns the package directories whose task failed, either by returning
+    ``False`` or by raising.
+    """
+    failed: list[Path] = []
+    if not package_dirs:
+        return failed
+    max_workers = min(os.cpu_count() or 1, len(package_dirs))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [(package_dir, executor.submit(task, package_dir)) for package_dir in package_dirs]
+        for package_dir, future in futures:
+            try:
+                succeeded = future.result()
+            except Exception as e:
+                print(f"Error: {package_dir.name}: {e}")
+                succeeded = False
+            if not succeeded:
+                failed.append(package_dir)
+    return failed
+
+
 def main():
     print("Setting up your environment...")
 
@@ -144,23 +178,29 @@ def main():
         return 1
 
     # Get list of packages to process (from args or all)
-    args = sys.argv[1:]
-    process_all = len(args) == 0
-
-    # Process each package directory
-    for package_dir in sorted(SRC_DIR.iterdir()):
-        if not package_dir.is_dir():
-            print(f"Skipping non-directory: {package_dir}")
-            continue
-
-        # Check if this package should be processed
-        if not process_all and package_dir.name not in args:
-            print(f"Skipping non-argument directory: {package_dir}")
-            continue
-
-        if not setup_package(package_dir):
+    package_dirs = list_package_dirs(sys.argv[1:])
+
+    # Install one package at a time: every `wally install` updates the same
+    # per-user registry index clone and download cache, without locking. A
+    # failed install does not stop the others from being set up.
+    installed: list[Path] = []
+    failed: list[Path] = []
+    for package_dir in package_dirs:
+        (installed if install_package(package_dir) else failed).append(package_dir)
+
+    # wally-package-types resolves paths through the project sourcemap, so it
+    # must see every freshly installed Packages directory. Generate it once
+    # here rather than per package, since all packages share the same file.
+    if any((package_dir / "Packages").is_dir() for package_dir in installed):
+        print("Generating sourcemap...")
+        if not run_command(
+            ["rojo", "sourcemap", ".", "-o", "sourcemap.json"],
+            "Failed to generate sourcemap."
+        ):
             return 1
 
+    failed += run_in_parallel(finalize_package, installed)
+
     # Regenerate final sourcemap
     print("Regenerating sourcemap...")
     if not run_command(
@@ -169,6 +209,10 @@ def main():
     ):
         return 1
 
+    if failed:
+        print(f"Setup failed for: {', '.join(sorted(package_dir.name for package_dir in failed))}")
+        return 1
+
     print("Setup complete!  :D")
     return 0
 
@@ -25,10 +25,10 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from _common import SRC_DIR, find_project_root
+from _common import SRC_DIR, find_project_root, list_package_dirs, parse_wally_toml
 
-# Wally dependency section headers in wally.toml.
-_DEP_SECTIONS = {"[dependencies]", "[server-dependencies]", "[dev-dependencies]"}
+# Wally dependency sections in wally.toml.
+_DEP_SECTIONS = ("dependencies", "server-dependencies", "dev-dependencies")
 
 
 def _has_wally_dependencies(package_dir: Path) -> bool:
@@ -37,17 +37,8 @@ def _has_wally_dependencies(package_dir: Path) -> bool:
     if not wally_toml.is_file():
         return False
 
-    in_dep_section = False
-    for raw_line in wally_toml.read_text(encoding="utf-8").splitlines():
-        line = raw_line.split("#", 1)[0].strip()
-        if not line:
-            continue
-        if line.startswith("["):
-            in_dep_section = line in _DEP_SECTIONS
-            continue
-        if in_dep_section and "=" in line:
-            return True
-    return False
+    config = parse_wally_toml(wally_toml)
+    return any(config.get(section) for section in _DEP_SECTIONS)
 
 
 def _needs_setup(package_dir: Path) -> bool:
@@ -58,7 +49,7 @@ def _needs_setup(package_dir: Path) -> bool:
 def _resolve_packages(package: str) -> list[str]:
     """Resolve the runner's package selector to concrete lib/ directory names."""
     if package == "all":
-        return [p.name for p in sorted(SRC_DIR.iterdir()) if p.is_dir()]
+        return [p.name for p in list_package_dirs()]
     if package == "last":
         last_file = Path("test") / "last_tested_package.txt"
         if last_file.is_file():
@@ -120,13 +120,6 @@ def extract_changed_packages(changed_files: list[str]) -> list[str]:
     return sorted(packages)
 
 
-def write_output(name: str, value: str) -> None:
-    github_output = os.getenv("GITHUB_OUTPUT")
-    if github_output:
-        with open(github_output, "a", encoding="utf-8") as f:
-            f.write(f"{name}={value}\n")
-
-
 def main() -> int:
     args = parse_args()
 